@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du comportement de XMLFormatter._transform_all sur des blocs ExpProps de référence.
+
+Lancement : python -m unittest test_xml_formatter
+"""
+
+import unittest
+
+from xml_formatter import XMLFormatter
+
+
+class TransformAllTest(unittest.TestCase):
+    """Cas de référence des corrections "no variable linked", de synchronisation et de casse."""
+
+    def assertTransformed(self, content: str, expected: str, rules=None):
+        result, changed = XMLFormatter._transform_all(content, rules=rules if rules is not None else {})
+        self.assertEqual(result, expected)
+        self.assertEqual(changed, expected != content)
+
+    def test_no_var_replaces_main_tag_and_pvid(self):
+        """La balise principale et PvID reçoivent la SymVarName encodée du bloc."""
+        self.assertTransformed(
+            '<ExpProps_3 NODE="zenOn(R) embedded object"><Name>BarGraph.XVariable</Name>'
+            '<ExpPropValue>&lt;XVariable Ver="1"&gt;&amp;lt;no variable linked&amp;gt;'
+            '&lt;ProjectVar Ver="1" PvID="&amp;lt;no variable linked&amp;gt;"/&gt;'
+            '&lt;SymVarName&gt;BGIntelliBlowerSpace[1]&lt;/SymVarName&gt;&lt;/XVariable&gt;</ExpPropValue></ExpProps_3>',
+            '<ExpProps_3 NODE="zenOn(R) embedded object"><Name>BarGraph.XVariable</Name>'
+            '<ExpPropValue>&lt;XVariable Ver="1"&gt;BGIntelliBlowerSpace[1]'
+            '&lt;ProjectVar Ver="1" PvID="BGIntelliBlowerSpace[1]"/&gt;'
+            '&lt;SymVarName&gt;BGIntelliBlowerSpace[1]&lt;/SymVarName&gt;&lt;/XVariable&gt;</ExpPropValue></ExpProps_3>',
+        )
+
+    def test_no_var_never_paired_across_blocks(self):
+        """Un marqueur hors bloc, ou dans un bloc sans SymVarName, n'est pas apparié au bloc suivant."""
+        content = (
+            '<Note>&amp;lt;no variable linked&amp;gt;</Note>'
+            '<ExpProps_1><Name>A</Name><ExpPropValue>&lt;Variable Ver="1"&gt;&amp;lt;no variable linked&amp;gt;'
+            '&lt;/Variable&gt;</ExpPropValue></ExpProps_1>'
+            '<ExpProps_2><Name>B</Name><ExpPropValue>&lt;Variable Ver="1"&gt;VarB'
+            '&lt;SymVarName&gt;VarB&lt;/SymVarName&gt;&lt;/Variable&gt;</ExpPropValue></ExpProps_2>'
+        )
+        self.assertTransformed(content, content)
+
+    def test_sync_keeps_block_attributes_and_layout(self):
+        """La synchronisation ne réécrit que le contenu d'ExpPropValue."""
+        self.assertTransformed(
+            '<ExpProps_5 NODE="zenOn(R) embedded object" Extra="1">\r\n\t<Name>Color</Name>\r\n'
+            '\t<ExpPropValue>&lt;Variable Ver="1" MainVersion="7500"&gt;OldVar'
+            '&lt;ProjectVar Ver="1" PvID="OldVar"/&gt;<SymVarName>NewVar</SymVarName></ExpPropValue>\r\n</ExpProps_5>',
+            '<ExpProps_5 NODE="zenOn(R) embedded object" Extra="1">\r\n\t<Name>Color</Name>\r\n'
+            '\t<ExpPropValue>&lt;Variable Ver="1" MainVersion="7500"&gt;NewVar'
+            '&lt;ProjectVar Ver="1" PvID="NewVar"/&gt;<SymVarName>NewVar</SymVarName></ExpPropValue>\r\n</ExpProps_5>',
+        )
+
+    def test_sync_copies_backslashes_verbatim(self):
+        """Une variable contenant des barres obliques inverses est recopiée telle quelle."""
+        self.assertTransformed(
+            '<ExpProps_1><Name>Color</Name><ExpPropValue>&lt;Variable Ver="1"&gt;OldVar'
+            '&lt;ProjectVar Ver="1" PvID="OldVar"/&gt;<SymVarName>1Var\\1\\n</SymVarName></ExpPropValue></ExpProps_1>',
+            '<ExpProps_1><Name>Color</Name><ExpPropValue>&lt;Variable Ver="1"&gt;1Var\\1\\n'
+            '&lt;ProjectVar Ver="1" PvID="1Var\\1\\n"/&gt;<SymVarName>1Var\\1\\n</SymVarName></ExpPropValue></ExpProps_1>',
+        )
+
+    def test_case_rules_run_before_sync(self):
+        """Les règles de casse passent avant la synchronisation : PvID intact si les noms concordent."""
+        self.assertTransformed(
+            '<ExpProps_1><Name>Color</Name><ExpPropValue>&lt;Variable Ver="1" PvID="Stale"&gt;'
+            'BGIntelliBlowerNumberStation[1]&lt;/Variable&gt;'
+            '<SymVarName>BGintelliBlowerNumberStation[1]</SymVarName></ExpPropValue></ExpProps_1>',
+            '<ExpProps_1><Name>Color</Name><ExpPropValue>&lt;Variable Ver="1" PvID="Stale"&gt;'
+            'BGintelliBlowerNumberStation[1]&lt;/Variable&gt;'
+            '<SymVarName>BGintelliBlowerNumberStation[1]</SymVarName></ExpPropValue></ExpProps_1>',
+            rules={'BGIntelliBlowerNumberStation[': 'BGintelliBlowerNumberStation['},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
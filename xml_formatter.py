@@ -14,152 +14,285 @@ AVANTAGE : Plus besoin de mapping manuel ! L'application détecte automatiquemen
 les variables correctes à partir du contenu SymVarName de chaque bloc.
 """
 
+import argparse
+import codecs
+import functools
+import itertools
+import logging
+import mmap
 import os
 import re
 import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+log = logging.getLogger(__name__)
+
+# Marqueur laissé par zenOn lorsqu'aucune variable n'est liée
+_NO_VAR_LINKED = '&amp;lt;no variable linked&amp;gt;'
+
+# Patterns compilés une seule fois au chargement du module
+_PAT_EXPPROPS_OPEN = re.compile(r'<ExpProps_(\d+)[^>]*>')
+_PAT_SYMVAR = re.compile(r'<SymVarName>([^<]+)</SymVarName>')
+_PAT_SYMVAR_ENCODED = re.compile(r'&lt;SymVarName&gt;([^&]+)&lt;/SymVarName&gt;')
+_PAT_VARTYPE = re.compile(r'&lt;(\w+)\s+Ver="1"[^&]*&gt;([^&]*)')
+_PAT_PVID_ATTR = re.compile(r'(PvID=)"[^"]*"')
+_PAT_NON_EMPTY_LINE = re.compile(r'\S[^\n]*')
+
+# Balises des éléments enfants d'un bloc ExpProps, construites une seule fois
+_TAGS_NAME = ('<Name>', '</Name>')
+_TAGS_EXPPROPVALUE = ('<ExpPropValue>', '</ExpPropValue>')
+
+# Aucune transformation fixe - tout est détecté automatiquement
+# (paires littérales recherche → remplacement, ex: 'BGIntelliBlowerNumberStation[' → 'BGintelliBlowerNumberStation[')
+_TRANSFORMATIONS = {}
+# Plus besoin de mapping fixe - détection automatique des variables !
+
+# Taille du tampon de lecture/écriture des fichiers (1 Mo)
+_IO_BUFFER_SIZE = 1 << 20
+
+# Nombre de caractères encodés à la fois lors de l'écriture (256 Ki)
+_ENCODE_CHUNK_SIZE = 1 << 18
+
+# En dessous de ce nombre de fichiers, le traitement reste séquentiel
+_PARALLEL_MIN_FILES = 4
+
+
+@functools.lru_cache(maxsize=128)
+def _var_type_pattern(var_type: str):
+    """Retourne le pattern compilé de la balise principale pour un type de variable."""
+    return re.compile(r'(&lt;' + re.escape(var_type) + r'\s+Ver="1"[^&]*&gt;)[^&]*')
 
 
 class XMLFormatter:
     """Classe pour formater les fichiers XML selon les patterns identifiés."""
     
-    def __init__(self):
-        # Aucune transformation fixe - tout est détecté automatiquement
-        self.transformations = {}
-        
-        # Plus besoin de mapping fixe - détection automatique des variables !
-
-    def backup_file(self, file_path: Path) -> Path:
+    @staticmethod
+    def backup_file(file_path: Path) -> Path:
         """Crée une sauvegarde du fichier original."""
         backup_path = file_path.with_suffix(file_path.suffix + '.backup')
-        shutil.copy2(file_path, backup_path)
-        print(f"✓ Sauvegarde créée: {backup_path}")
+        
+        # Remplacer une éventuelle sauvegarde précédente
+        try:
+            backup_path.unlink()
+        except FileNotFoundError:
+            pass
+        
+        # Lien physique : aucune copie de données. Le fichier original est ensuite
+        # réécrit via un fichier temporaire + os.replace, la sauvegarde garde donc l'ancien contenu.
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            # Système de fichiers sans liens physiques : copie classique
+            shutil.copy2(file_path, backup_path)
+        log.debug("  ✓ Sauvegarde créée: %s", backup_path)
         return backup_path
 
-    def is_single_line_xml(self, content: str) -> bool:
+    @staticmethod
+    def is_single_line_xml(content: str) -> bool:
         """Vérifie si le XML est sur une seule ligne."""
-        lines = content.strip().split('\n')
-        # Si le contenu principal est sur moins de 3 lignes, c'est probablement du XML sur une seule ligne
-        return len([line for line in lines if line.strip()]) <= 3
+        # Si le contenu principal est sur moins de 3 lignes, c'est probablement du XML sur une seule ligne.
+        # On s'arrête à la 4e ligne non vide : ni copie du contenu, ni liste de toutes les lignes.
+        non_empty_lines = sum(1 for _ in itertools.islice(_PAT_NON_EMPTY_LINE.finditer(content), 4))
+        return non_empty_lines <= 3
 
-    def apply_basic_transformations(self, content: str) -> str:
-        """Applique les transformations de base (changements de casse, etc.)."""
+    @staticmethod
+    def apply_basic_transformations(content: str,
+                                    rules: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+        """
+        Applique les transformations de base (changements de casse, etc.).
+        
+        Args:
+            rules: Règles littérales recherche → remplacement (par défaut _TRANSFORMATIONS)
+            
+        Returns:
+            Tuple (contenu modifié, True si au moins une règle a été appliquée)
+        """
         modified_content = content
+        changed = False
+        
+        debug = log.isEnabledFor(logging.DEBUG)
         
-        for pattern, replacement in self.transformations.items():
-            # Compter les occurrences avant remplacement
-            matches = re.findall(pattern, modified_content)
-            if matches:
-                print(f"    🔄 Trouvé {len(matches)} occurrence(s) du pattern: {pattern}")
-                modified_content = re.sub(pattern, replacement, modified_content)
+        # Remplacements littéraux : str.replace évite le moteur d'expressions régulières
+        # (plus rapide qu'une alternative compilée tant que les règles restent peu nombreuses)
+        if rules is None:
+            rules = _TRANSFORMATIONS
+        
+        for needle, replacement in rules.items():
+            if needle in modified_content:
+                # Le comptage n'est utile qu'au débogage
+                if debug:
+                    log.debug("    🔄 Trouvé %d occurrence(s) de: %s", modified_content.count(needle), needle)
+                modified_content = modified_content.replace(needle, replacement)
+                changed = True
             
-        return modified_content
+        return modified_content, changed
 
-    def fix_no_variable_linked(self, content: str) -> str:
+    @staticmethod
+    def fix_no_variable_linked(block: str) -> Optional[str]:
         """
-        Logique simple : trouve tous les segments qui ont "no variable linked" 
-        et une SymVarName encodée, puis remplace par la variable trouvée.
+        Logique simple : si le bloc ExpProps contient "no variable linked" et une
+        SymVarName encodée, remplace toutes les occurrences (valeur et PvID)
+        par la variable trouvée.
+        
+        Returns:
+            La variable trouvée, ou None si le bloc n'est pas concerné
         """
-        modified_content = content
+        # Rien à faire dans ce bloc : on le laisse tel quel
+        if _NO_VAR_LINKED not in block:
+            return None
         
         # Pattern avec balises encodées : &lt;SymVarName&gt; au lieu de <SymVarName>
-        pattern = r'&amp;lt;no variable linked&amp;gt;(.*?)&lt;SymVarName&gt;([^&]+)&lt;/SymVarName&gt;'
+        sym_var_match = _PAT_SYMVAR_ENCODED.search(block)
+        if not sym_var_match:
+            return None
         
-        def replace_with_variable(match):
-            middle_part = match.group(1)  # Ce qu'il y a entre "no variable linked" et SymVarName
-            variable_name = match.group(2)  # La variable dans SymVarName
-            
-            if variable_name and variable_name.strip():
-                print(f"    🔄 Remplacement par variable: '{variable_name}'")
-                # Remplacer "no variable linked" par la vraie variable
-                return variable_name + middle_part + f'&lt;SymVarName&gt;{variable_name}&lt;/SymVarName&gt;'
-            
-            return match.group(0)  # Pas de changement si pas de variable
+        variable_name = sym_var_match.group(1)
+        if not variable_name.strip():
+            return None
         
-        # Compter les matches avant traitement
-        matches = re.findall(pattern, modified_content)
-        print(f"    🔍 Trouvé {len(matches)} segment(s) à traiter")
+        log.debug("    🔄 Remplacement par variable: '%s'", variable_name)
+        return variable_name
+
+    @staticmethod
+    def synchronize_block(name: str, exp_prop_value: str) -> Optional[str]:
+        """
+        Synchronise les variables d'un bloc : si une variable existe dans SymVarName,
+        elle doit aussi être présente dans PvID et dans la balise principale.
         
-        # Appliquer les remplacements
-        modified_content = re.sub(pattern, replace_with_variable, modified_content)
+        Returns:
+            Le contenu d'ExpPropValue réécrit, ou None s'il est inchangé
+        """
+        # Chercher la variable dans SymVarName (sortie immédiate à chaque test négatif)
+        sym_var_match = _PAT_SYMVAR.search(exp_prop_value)
+        if not sym_var_match:
+            return None
         
-        # Deuxième passe : corriger les PvID qui contiennent encore "no variable linked"
-        # Chercher les PvID="&amp;lt;no variable linked&amp;gt;" et les remplacer
-        pvid_pattern = r'PvID="&amp;lt;no variable linked&amp;gt;"([^&]*)&lt;SymVarName&gt;([^&]+)&lt;/SymVarName&gt;'
+        # Si SymVarName ne contient pas de vraie variable (vide)
+        sym_var_name = sym_var_match.group(1)
+        if not sym_var_name.strip():
+            return None
         
-        def fix_pvid(match):
-            middle_part = match.group(1)
-            variable_name = match.group(2)
-            
-            if variable_name and variable_name.strip():
-                print(f"    🔄 Correction PvID pour: '{variable_name}'")
-                return f'PvID="{variable_name}"{middle_part}&lt;SymVarName&gt;{variable_name}&lt;/SymVarName&gt;'
-            
-            return match.group(0)
+        # Extraire le type de variable (ex: "BackColorVariable2", "Variable", etc.)
+        var_type_match = _PAT_VARTYPE.search(exp_prop_value)
+        if not var_type_match:
+            return None
+        
+        var_type = var_type_match.group(1)
+        current_var = var_type_match.group(2)
+        
+        # La variable actuelle correspond déjà à SymVarName : bloc inchangé
+        if current_var == sym_var_name:
+            return None
         
-        # Compter et appliquer les corrections PvID
-        pvid_matches = re.findall(pvid_pattern, modified_content)
-        print(f"    🔍 Trouvé {len(pvid_matches)} PvID à corriger")
-        modified_content = re.sub(pvid_pattern, fix_pvid, modified_content)
+        log.debug("  🔄 Synchronisation %s: '%s' → '%s'", name, current_var, sym_var_name)
         
-        return modified_content
+        # Remplacer dans la balise principale puis dans PvID : la valeur est recollée directement
+        # après le groupe conservé, sans fonction de rappel ni gabarit à analyser par occurrence
+        new_exp_prop_value, main_count = _splice_after_group(
+            _var_type_pattern(var_type), exp_prop_value, sym_var_name
+        )
+        new_exp_prop_value, pvid_count = _splice_after_group(
+            _PAT_PVID_ATTR, new_exp_prop_value, f'"{sym_var_name}"'
+        )
+        log.debug("    🔍 %d balise(s) principale(s), %d PvID synchronisé(s)", main_count, pvid_count)
+        
+        return new_exp_prop_value
 
-    def synchronize_variables(self, content: str) -> str:
+    @staticmethod
+    def _transform_all(content: str, fix_no_var: bool = True, synchronize: bool = True,
+                       apply_case: bool = True,
+                       rules: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
         """
-        Synchronise toutes les variables : si une variable existe dans SymVarName,
-        elle doit aussi être présente dans PvID et dans la balise principale.
+        Applique toutes les transformations : corrections de casse sur tout le contenu, puis
+        correction "no variable linked" et synchronisation en un seul parcours des blocs ExpProps.
+        
+        Args:
+            fix_no_var: False pour sauter la correction "no variable linked"
+            synchronize: False pour sauter la synchronisation des variables
+            apply_case: False pour sauter les corrections de casse
+            rules: Règles de casse à appliquer (par défaut _TRANSFORMATIONS)
+            
+        Returns:
+            Tuple (contenu, True si au moins une transformation a modifié le contenu)
         """
-        modified_content = content
+        parts = []
+        segments = 0
+        changed = False
         
-        # Pattern pour trouver tous les blocs ExpProps
-        pattern = r'<ExpProps_(\d+)[^>]*>.*?<Name>([^<]+)</Name>.*?<ExpPropValue>(.*?)</ExpPropValue>.*?</ExpProps_\1>'
+        # 1. Transformations de base (changements de casse) en premier, comme avant la fusion :
+        # la synchronisation compare ensuite des noms de variables déjà corrigés
+        if apply_case:
+            content, changed = XMLFormatter.apply_basic_transformations(content, rules)
         
-        def synchronize_block(match):
-            prop_num = match.group(1)
-            name = match.group(2)
-            exp_prop_value = match.group(3)
-            
-            # Chercher la variable dans SymVarName
-            sym_var_match = re.search(r'<SymVarName>([^<]+)</SymVarName>', exp_prop_value)
+        if fix_no_var or synchronize:
+            # Références locales : pas de recherche d'attribut à chaque bloc de la boucle
+            append = parts.append
+            fix_block = XMLFormatter.fix_no_variable_linked
+            sync_block = XMLFormatter.synchronize_block
+            pos = 0
             
-            if sym_var_match:
-                sym_var_name = sym_var_match.group(1)
+            for block_start, block_end, _ in _iter_expprops(content):
+                block = content[block_start:block_end]
+                
+                # Test rapide avant tout découpage : le bloc a-t-il quelque chose à traiter ?
+                if not ((fix_no_var and _NO_VAR_LINKED in block) or (synchronize and '<SymVarName>' in block)):
+                    continue
                 
-                # Si SymVarName contient une vraie variable (pas vide)
-                if sym_var_name and sym_var_name.strip():
-                    # Extraire le type de variable (ex: "BackColorVariable2", "Variable", etc.)
-                    var_type_match = re.search(r'&lt;(\w+)\s+Ver="1"[^&]*&gt;([^&]*)', exp_prop_value)
-                    
-                    if var_type_match:
-                        var_type = var_type_match.group(1)
-                        current_var = var_type_match.group(2)
-                        
-                        # Si la variable actuelle ne correspond pas à SymVarName
-                        if current_var != sym_var_name:
-                            print(f"  🔄 Synchronisation {name}: '{current_var}' → '{sym_var_name}'")
-                            
-                            # Remplacer dans la balise principale
-                            new_exp_prop_value = re.sub(
-                                r'(&lt;' + re.escape(var_type) + r'\s+Ver="1"[^&]*&gt;)[^&]*',
-                                r'\1' + sym_var_name,
-                                exp_prop_value
-                            )
-                            
-                            # Remplacer dans PvID
-                            new_exp_prop_value = re.sub(
-                                r'PvID="[^"]*"',
-                                f'PvID="{sym_var_name}"',
-                                new_exp_prop_value
-                            )
-                            
-                            return f'<ExpProps_{prop_num} NODE="zenOn(R) embedded object"><Name>{name}</Name><ExpPropValue>{new_exp_prop_value}</ExpPropValue></ExpProps_{prop_num}>'
+                # Éléments enfants <Name> (texte non vide, sans balise) puis <ExpPropValue>
+                name_span = _child_text(block, _TAGS_NAME)
+                if name_span is None:
+                    continue
+                name = block[name_span[0]:name_span[1]]
+                if not name or '<' in name:
+                    continue
+                
+                value_span = _child_text(block, _TAGS_EXPPROPVALUE, name_span[1])
+                if value_span is None:
+                    continue
+                
+                # Le bloc est découpé autour du contenu d'ExpPropValue : seul ce contenu est réécrit,
+                # la balise ouvrante, ses attributs et la mise en forme sont conservés
+                head = block[:value_span[0]]
+                exp_prop_value = block[value_span[0]:value_span[1]]
+                tail = block[value_span[1]:]
+                block_changed = False
+                
+                # 2. Correction des "no variable linked" (détection automatique)
+                variable_name = fix_block(block) if fix_no_var else None
+                if variable_name is not None:
+                    segments += 1
+                    head = head.replace(_NO_VAR_LINKED, variable_name)
+                    exp_prop_value = exp_prop_value.replace(_NO_VAR_LINKED, variable_name)
+                    tail = tail.replace(_NO_VAR_LINKED, variable_name)
+                    block_changed = True
+                
+                # 3. Synchronisation des variables sur le bloc déjà corrigé
+                synchronized = sync_block(name, exp_prop_value) if synchronize else None
+                if synchronized is not None:
+                    exp_prop_value = synchronized
+                    block_changed = True
+                
+                # Seuls les blocs réécrits coupent le contenu ; le reste est recopié en une fois
+                if block_changed:
+                    append(content[pos:block_start])
+                    append(head)
+                    append(exp_prop_value)
+                    append(tail)
+                    pos = block_end
             
-            return match.group(0)  # Retourner inchangé
+            if parts:
+                append(content[pos:])
+                content = ''.join(parts)
+                changed = True
         
-        modified_content = re.sub(pattern, synchronize_block, modified_content, flags=re.DOTALL)
+        log.debug("    🔍 Trouvé %d segment(s) 'no variable linked' traité(s)", segments)
         
-        return modified_content
+        return content, changed
 
     def format_xml_file(self, file_path: Path) -> bool:
         """
@@ -172,67 +305,74 @@ class XMLFormatter:
             bool: True si des modifications ont été apportées, False sinon
         """
         try:
-            print(f"\n🔄 Traitement de: {file_path}")
+            # Une seule ligne INFO par fichier (résultat) ; le détail n'apparaît qu'avec -v
+            log.debug("🔄 Traitement de: %s", file_path)
             
             # Lire le contenu du fichier
-            with open(file_path, 'r', encoding='utf-16') as f:
-                original_content = f.read()
-            
-            # Détecter si c'est du XML sur une seule ligne
-            if self.is_single_line_xml(original_content):
-                print(f"  📄 Détection: XML sur une seule ligne")
-            else:
-                print(f"  📄 Détection: XML multi-lignes")
-            
-            # Créer une sauvegarde
-            self.backup_file(file_path)
+            original_content = _read_utf16(file_path)
             
-            # Appliquer les transformations
-            modified_content = original_content
+            # Tests de sous-chaînes rapides sur le texte décodé (représentation compacte,
+            # bien plus rapide que sur les octets UTF-16) : quelles étapes ont quelque chose à traiter ?
+            has_case = any(needle in original_content for needle in _TRANSFORMATIONS)
+            # (la correction "no variable linked" a aussi besoin d'une SymVarName encodée)
+            has_no_var = _NO_VAR_LINKED in original_content and '&lt;SymVarName&gt;' in original_content
+            has_symvar = '<SymVarName>' in original_content
             
-            # Debug simple : vérifier ce qu'on doit traiter
-            no_var_count = original_content.count('&amp;lt;no variable linked&amp;gt;')
-            symvar_count_raw = original_content.count('<SymVarName>')
-            symvar_count_encoded = original_content.count('&lt;SymVarName&gt;')
+            if not (has_case or has_no_var or has_symvar):
+                log.info("ℹ️ Aucune modification nécessaire pour: %s", file_path)
+                return False
             
-            print(f"  🔍 Debug: {no_var_count} 'no variable linked' à traiter")
-            print(f"  🔍 Debug: {symvar_count_raw} balises SymVarName brutes")
-            print(f"  🔍 Debug: {symvar_count_encoded} balises SymVarName encodées")
+            debug = log.isEnabledFor(logging.DEBUG)
             
-            # 1. Transformations de base (changements de casse)
-            print(f"  📝 Étape 1: Transformations de base...")
-            modified_content = self.apply_basic_transformations(modified_content)
+            # Détecter si c'est du XML sur une seule ligne
+            if debug:
+                if self.is_single_line_xml(original_content):
+                    log.debug("  📄 Détection: XML sur une seule ligne")
+                else:
+                    log.debug("  📄 Détection: XML multi-lignes")
             
-            # 2. Correction des "no variable linked" (détection automatique)
-            print(f"  📝 Étape 2: Correction 'no variable linked'...")
-            modified_content = self.fix_no_variable_linked(modified_content)
+            # Debug simple : vérifier ce qu'on doit traiter (comptages coûteux, seulement en débogage)
+            if debug:
+                log.debug("  🔍 Debug: %d 'no variable linked' à traiter", original_content.count(_NO_VAR_LINKED))
+                log.debug("  🔍 Debug: %d balises SymVarName brutes", original_content.count('<SymVarName>'))
+                log.debug("  🔍 Debug: %d balises SymVarName encodées", original_content.count('&lt;SymVarName&gt;'))
             
-            # 3. Synchronisation générale des variables
-            print(f"  📝 Étape 3: Synchronisation des variables...")
-            modified_content = self.synchronize_variables(modified_content)
+            # Casse, "no variable linked" et synchronisation en un seul parcours
+            log.debug("  📝 Transformations (casse, 'no variable linked', synchronisation)...")
+            modified_content, changed = self._transform_all(
+                original_content,
+                fix_no_var=has_no_var,
+                synchronize=has_symvar,
+                apply_case=has_case
+            )
             
-            # Vérifier s'il y a eu des changements
-            if modified_content != original_content:
-                # Écrire le fichier modifié
-                with open(file_path, 'w', encoding='utf-16') as f:
-                    f.write(modified_content)
+            # Vérifier s'il y a eu des changements (indicateur des transformations,
+            # sans comparer caractère par caractère deux contenus de plusieurs Mo)
+            if changed:
+                # Créer une sauvegarde uniquement si le fichier va être réécrit
+                self.backup_file(file_path)
+                
+                # Écrire le fichier modifié dans un fichier temporaire puis le substituer
+                # à l'original (ne jamais tronquer l'inode partagé avec la sauvegarde)
+                _replace_file(file_path, modified_content)
                 
-                print(f"✓ Fichier modifié avec succès: {file_path}")
+                log.info("✓ Fichier modifié avec succès: %s", file_path)
                 return True
             else:
-                print(f"ℹ️ Aucune modification nécessaire pour: {file_path}")
+                log.info("ℹ️ Aucune modification nécessaire pour: %s", file_path)
                 return False
                 
         except Exception as e:
-            print(f"❌ Erreur lors du traitement de {file_path}: {str(e)}")
+            log.error("❌ Erreur lors du traitement de %s: %s", file_path, e)
             return False
 
-    def format_directory(self, directory_path: Path) -> Dict[str, int]:
+    def format_directory(self, directory_path: Path, jobs: Optional[int] = None) -> Dict[str, int]:
         """
         Formate tous les fichiers XML dans un répertoire.
         
         Args:
             directory_path: Chemin vers le répertoire contenant les fichiers XML
+            jobs: Nombre de processus (par défaut : un par cœur, 1 = séquentiel)
             
         Returns:
             Dict avec les statistiques de traitement
@@ -244,34 +384,236 @@ class XMLFormatter:
         }
         
         if not directory_path.exists():
-            print(f"❌ Le répertoire {directory_path} n'existe pas.")
+            log.error("❌ Le répertoire %s n'existe pas.", directory_path)
             return stats
         
-        # Trouver tous les fichiers XML
-        xml_files = list(directory_path.glob('*.XML')) + list(directory_path.glob('*.xml'))
+        # Trouver tous les fichiers XML (un seul parcours, extension insensible à la casse) ;
+        # le gestionnaire de contexte libère le descripteur du répertoire dès la fin du parcours
+        with os.scandir(directory_path) as entries:
+            xml_files = [
+                Path(entry.path) for entry in entries
+                if entry.is_file() and entry.name.lower().endswith('.xml')
+            ]
         
         if not xml_files:
-            print(f"ℹ️ Aucun fichier XML trouvé dans {directory_path}")
+            log.info("ℹ️ Aucun fichier XML trouvé dans %s", directory_path)
             return stats
         
-        print(f"📁 Traitement du répertoire: {directory_path}")
-        print(f"📄 {len(xml_files)} fichier(s) XML trouvé(s)")
+        log.info("📁 Traitement du répertoire: %s", directory_path)
+        log.info("📄 %d fichier(s) XML trouvé(s)", len(xml_files))
         
-        for xml_file in xml_files:
+        # Jamais plus de processus que de fichiers
+        workers = min(len(xml_files), jobs if jobs is not None else (os.cpu_count() or 1))
+        
+        # Peu de fichiers : le démarrage d'un pool de processus coûterait plus qu'il ne rapporte
+        if workers <= 1 or (jobs is None and len(xml_files) < _PARALLEL_MIN_FILES):
+            results = []
+            for index, xml_file in enumerate(xml_files):
+                # Le noyau lit le fichier suivant pendant le traitement de celui-ci
+                if index + 1 < len(xml_files):
+                    _prefetch(xml_files[index + 1])
+                results.append(_format_one(xml_file))
+        else:
+            # Chaque fichier est indépendant : traitement en parallèle, un fichier par tâche
+            # (des fichiers de plusieurs Mo : le coût d'échange est négligeable, et des lots
+            # de plusieurs fichiers laisseraient des processus sans travail)
+            # Le niveau de journalisation accompagne chaque tâche (pas d'initializer avant Python 3.7)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_format_one, xml_files,
+                                            itertools.repeat(log.getEffectiveLevel())))
+        
+        for xml_file, result in zip(xml_files, results):
             stats['total_files'] += 1
             
-            try:
-                if self.format_xml_file(xml_file):
-                    stats['modified_files'] += 1
-            except Exception as e:
+            if isinstance(result, Exception):
                 stats['errors'] += 1
-                print(f"❌ Erreur avec {xml_file}: {str(e)}")
+                log.error("❌ Erreur avec %s: %s", xml_file, result)
+            elif result:
+                stats['modified_files'] += 1
         
         return stats
 
 
+def _prefetch(file_path: Path):
+    """
+    Demande au système de charger le fichier en cache de manière asynchrone
+    (POSIX_FADV_WILLNEED), pour recouvrir la lecture disque par le traitement en cours.
+    Sans effet là où posix_fadvise n'existe pas (Windows).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(str(file_path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_utf16(file_path: Path) -> str:
+    """
+    Lit et décode un fichier UTF-16 via une projection mémoire : le décodage lit
+    directement les pages du fichier, sans copie intermédiaire du contenu en bytes.
+    """
+    with open(file_path, 'rb') as f:
+        # mmap refuse les fichiers vides
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'utf-16')
+
+
+def _write_utf16(file_path: Path, content: str):
+    """
+    Encode et écrit le contenu en UTF-16 par tranches, à travers un tampon de 1 Mo,
+    sans jamais matérialiser le fichier encodé complet en mémoire.
+    """
+    encoder = codecs.getincrementalencoder('utf-16')()
+    with open(file_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+        for start in range(0, len(content), _ENCODE_CHUNK_SIZE):
+            f.write(encoder.encode(content[start:start + _ENCODE_CHUNK_SIZE]))
+        f.write(encoder.encode('', final=True))
+
+
+def _replace_file(file_path: Path, content: str):
+    """
+    Remplace atomiquement le contenu d'un fichier : écriture dans un fichier temporaire
+    unique du même répertoire, puis os.replace. L'inode d'origine (partagé avec la
+    sauvegarde par lien physique) n'est jamais tronqué.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=file_path.name + '.', suffix='.tmp', dir=str(file_path.parent))
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    
+    try:
+        _write_utf16(tmp_path, content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        # Ne pas laisser de fichier temporaire orphelin
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _iter_expprops(content: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Parcourt les blocs <ExpProps_N ...>...</ExpProps_N> du contenu.
+    
+    La balise ouvrante est trouvée par une regex ancrée et la fin du bloc par une
+    recherche littérale de la balise fermante : aucun retour arrière, parcours linéaire.
+    
+    Yields:
+        Tuple (début, fin, numéro) de chaque bloc
+    """
+    scan = 0
+    while True:
+        match = _PAT_EXPPROPS_OPEN.search(content, scan)
+        if match is None:
+            return
+        
+        prop_num = match.group(1)
+        closing_tag = f'</ExpProps_{prop_num}>'
+        block_end = content.find(closing_tag, match.end())
+        if block_end < 0:
+            # Bloc non fermé : on reprend la recherche après sa balise ouvrante
+            scan = match.end()
+            continue
+        
+        block_end += len(closing_tag)
+        yield match.start(), block_end, prop_num
+        scan = block_end
+
+
+def _splice_after_group(pattern, text: str, value: str) -> Tuple[str, int]:
+    """
+    Remplace, dans chaque occurrence du pattern, tout ce qui suit le groupe 1 par value.
+    
+    Returns:
+        Tuple (texte réécrit, nombre d'occurrences remplacées)
+    """
+    parts = []
+    pos = 0
+    for match in pattern.finditer(text):
+        parts.append(text[pos:match.end(1)])
+        parts.append(value)
+        pos = match.end()
+    if not parts:
+        return text, 0
+    parts.append(text[pos:])
+    return ''.join(parts), len(parts) // 2
+
+
+def _child_text(block: str, tags: Tuple[str, str], start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Localise le texte d'un élément enfant <tag>...</tag> dans un bloc, comme un accès
+    par balise dans un arbre XML, sans parcours DOTALL de tout le bloc.
+    
+    Args:
+        tags: Balises ouvrante et fermante précalculées (ex: _TAGS_NAME)
+    
+    Returns:
+        Tuple (début, fin) du texte dans le bloc, ou None si l'élément est absent
+    """
+    open_tag, close_tag = tags
+    text_start = block.find(open_tag, start)
+    if text_start < 0:
+        return None
+    text_start += len(open_tag)
+    
+    text_end = block.find(close_tag, text_start)
+    if text_end < 0:
+        return None
+    
+    return text_start, text_end
+
+
+def _format_one(xml_file: Path, level: Optional[int] = None) -> Union[bool, Exception]:
+    """
+    Formate un fichier (fonction de module, utilisable par un pool de processus).
+    
+    Args:
+        level: Niveau de journalisation à configurer dans un processus du pool
+            (nécessaire sous Windows ; sans effet si la journalisation est déjà configurée)
+    
+    Returns:
+        Le résultat de format_xml_file, ou l'exception levée
+    """
+    if level is not None:
+        logging.basicConfig(stream=sys.stdout, format='%(message)s', level=level)
+    try:
+        return XMLFormatter().format_xml_file(xml_file)
+    except Exception as e:
+        return e
+
+
+def _positive_int(value: str) -> int:
+    """Type argparse : entier strictement positif."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"entier attendu: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"doit être au moins 1: {number}")
+    return number
+
+
 def main():
     """Fonction principale de l'application."""
+    parser = argparse.ArgumentParser(description="Formatage des fichiers XML zenOn du dossier ToFormat/")
+    parser.add_argument('-v', '--verbose', action='store_true', help="affiche les messages de débogage")
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                        help="nombre de processus en parallèle (par défaut : un par cœur, 1 = séquentiel)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(stream=sys.stdout, format='%(message)s', level=logging.DEBUG if args.verbose else logging.INFO)
+    
     print("🚀 Démarrage de l'application de formatage XML")
     print("=" * 50)
     
@@ -282,7 +624,7 @@ def main():
     toformat_path = Path("ToFormat")
     
     # Traiter tous les fichiers XML dans ToFormat/
-    stats = formatter.format_directory(toformat_path)
+    stats = formatter.format_directory(toformat_path, jobs=args.jobs)
     
     # Afficher les résultats
     print("\n" + "=" * 50)
@@ -294,7 +636,7 @@ def main():
     
     if stats['modified_files'] > 0:
         print(f"\n✓ {stats['modified_files']} fichier(s) ont été modifiés avec succès.")
-        print("💾 Les fichiers originaux ont été sauvegardés avec l'extension .backup")
+        print("💾 Les fichiers modifiés ont été sauvegardés avec l'extension .backup")
     
     if stats['errors'] > 0:
         print(f"\n⚠️ {stats['errors']} erreur(s) rencontrée(s). Vérifiez les messages ci-dessus.")